@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
-import runpy
+import importlib.util
+import sys
 from pathlib import Path
 
 
 def main() -> None:
     """Forward execution to the generalized content MCP entry point."""
     target = Path(__file__).with_name("content_mcp.py")
-    runpy.run_path(str(target), run_name="__main__")
+    spec = importlib.util.spec_from_file_location("__main__", target)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load content MCP server from {target}")
+    module = importlib.util.module_from_spec(spec)
+    # Register under the canonical name so a later `import content_mcp`
+    # reuses this module instead of executing the file a second time
+    sys.modules["content_mcp"] = module
+    spec.loader.exec_module(module)
 
 
 if __name__ == "__main__":
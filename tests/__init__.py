@@ -0,0 +1,5 @@
+"""Test package; re-exports the shared content_mcp loader."""
+
+from tests._mcp_loader import get_mcp_module
+
+__all__ = ["get_mcp_module"]
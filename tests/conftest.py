@@ -0,0 +1,51 @@
+"""Shared pytest fixtures for the MCP server test suite."""
+
+from __future__ import annotations
+
+import compileall
+import getpass
+import os
+from pathlib import Path
+
+import pytest
+
+from tests._mcp_loader import get_mcp_module
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Warm the bytecode cache for the MCP server before any test loads
+    # it, so the first in-process import reads the .pyc straight away
+    server_source = Path(__file__).resolve().parents[1] / "mcp-server" / "content_mcp.py"
+    compileall.compile_file(str(server_source), quiet=1)
+
+    # Keep tmp_path directories on tmpfs where available; xdist workers
+    # receive an explicit basetemp from the controller, so the guard
+    # leaves them (and any user-provided --basetemp) alone. The path is
+    # stable per user so successive runs recycle the same directory
+    # instead of piling up pid-named copies in shared memory
+    if config.option.basetemp is None and os.access("/dev/shm", os.W_OK):
+        config.option.basetemp = f"/dev/shm/pytest-{getpass.getuser()}"
+
+
+@pytest.fixture(scope="session")
+def content_mcp_module():
+    """The content_mcp module, loaded once for the whole session."""
+    return get_mcp_module()
+
+
+@pytest.fixture(scope="session")
+def content_mcp(content_mcp_module):
+    """Function-style alias for tests that take the module as a parameter."""
+    return content_mcp_module
+
+
+@pytest.fixture(autouse=True)
+def _inject_content_mcp(request: pytest.FixtureRequest) -> None:
+    """Give TestCase classes that declare ``content_mcp`` the loaded module.
+
+    The module is requested lazily, so sessions that select only agent
+    tests never load the MCP server at all.
+    """
+    cls = request.cls
+    if cls is not None and "content_mcp" in getattr(cls, "__annotations__", {}):
+        cls.content_mcp = request.getfixturevalue("content_mcp_module")
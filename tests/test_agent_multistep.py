@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections import deque
 from dataclasses import dataclass
 from typing import Any
 from unittest import IsolatedAsyncioTestCase
@@ -78,7 +79,7 @@ class MultiStepPlanningTests(IsolatedAsyncioTestCase):
 
         agent.get_available_tools_for_function_calling = fake_get_available_tools  # type: ignore[assignment]
 
-        responses = [
+        responses = deque([
             _FakeResponse(
                 choices=[
                     _FakeChoice(
@@ -127,13 +128,13 @@ class MultiStepPlanningTests(IsolatedAsyncioTestCase):
                     )
                 ]
             ),
-        ]
+        ])
 
         class _FakeCompletions:
             async def create(self, **_: Any) -> _FakeResponse:
                 if not responses:
                     raise AssertionError("No responses left for fake completions")
-                return responses.pop(0)
+                return responses.popleft()
 
         class _FakeChat:
             def __init__(self) -> None:
@@ -169,6 +170,92 @@ class MultiStepPlanningTests(IsolatedAsyncioTestCase):
         self.assertEqual(agent.conversation_history[-1]["content"], result)
         self.assertEqual(agent.conversation_history[-1]["role"], "assistant")
 
+    async def test_agent_replays_plan_template_on_repeat_intent(self) -> None:
+        agent = LocalContentAgent()
+
+        tool_invocations: list[tuple[str, dict[str, Any]]] = []
+
+        async def fake_call_mcp_tool(name: str, arguments: dict[str, Any]) -> str:
+            tool_invocations.append((name, arguments))
+            return "Fetched page content" if name == "fetch_web_content" else "Blog prompt instructions"
+
+        agent.call_mcp_tool = fake_call_mcp_tool  # type: ignore[assignment]
+
+        tool_definitions = [
+            {
+                "type": "function",
+                "function": {
+                    "name": "fetch_web_content",
+                    "description": "fetch web",
+                    "parameters": {"type": "object", "properties": {}, "required": []},
+                },
+            },
+        ]
+
+        async def fake_get_available_tools(_: str | None = None) -> list[dict[str, Any]]:
+            return tool_definitions
+
+        agent.get_available_tools_for_function_calling = fake_get_available_tools  # type: ignore[assignment]
+
+        responses = deque([
+            _FakeResponse(
+                choices=[
+                    _FakeChoice(
+                        message=_FakeMessage(
+                            content="",
+                            tool_calls=[
+                                _FakeToolCall(
+                                    id="call-1",
+                                    function=_FakeFunction(
+                                        name="fetch_web_content",
+                                        arguments=json.dumps({"url": "https://example.com/one"}),
+                                    ),
+                                )
+                            ],
+                        )
+                    )
+                ]
+            ),
+            _FakeResponse(
+                choices=[_FakeChoice(message=_FakeMessage(content="First summary.", tool_calls=None))]
+            ),
+            _FakeResponse(
+                choices=[_FakeChoice(message=_FakeMessage(content="Second summary.", tool_calls=None))]
+            ),
+        ])
+
+        class _FakeCompletions:
+            async def create(self, **_: Any) -> _FakeResponse:
+                if not responses:
+                    raise AssertionError("No responses left for fake completions")
+                return responses.popleft()
+
+        class _FakeChat:
+            def __init__(self) -> None:
+                self.completions = _FakeCompletions()
+
+        class _FakeClient:
+            def __init__(self) -> None:
+                self.chat = _FakeChat()
+
+        agent.client = _FakeClient()  # type: ignore[assignment]
+
+        first = await agent.process_message("summarize this page: https://example.com/one")
+        second = await agent.process_message("summarize this page: https://example.com/two")
+
+        self.assertEqual(first, "First summary.")
+        self.assertEqual(second, "Second summary.")
+        # The second turn skipped the planning round-trip: the tool ran
+        # directly with the new URL bound into the learned template.
+        self.assertEqual(len(responses), 0)
+        self.assertEqual(
+            tool_invocations,
+            [
+                ("fetch_web_content", {"url": "https://example.com/one"}),
+                ("fetch_web_content", {"url": "https://example.com/two"}),
+            ],
+        )
+
     async def test_agent_retries_after_connection_error(self) -> None:
         agent = LocalContentAgent()
 
@@ -236,7 +323,7 @@ class MultiStepPlanningTests(IsolatedAsyncioTestCase):
             ]
         )
 
-        responses = [first_call_response, second_call_response]
+        responses = deque([first_call_response, second_call_response])
 
         class _FlakyCompletions:
             def __init__(self) -> None:
@@ -248,7 +335,7 @@ class MultiStepPlanningTests(IsolatedAsyncioTestCase):
                     raise Exception("Connection error")
                 if not responses:
                     raise AssertionError("No responses left for fake completions")
-                return responses.pop(0)
+                return responses.popleft()
 
         class _FakeChat:
             def __init__(self) -> None:
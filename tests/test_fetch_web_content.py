@@ -2,10 +2,7 @@
 
 from __future__ import annotations
 
-import importlib.util
 import socket
-import sys
-from pathlib import Path
 from threading import Thread
 from types import ModuleType
 from typing import ClassVar
@@ -14,29 +11,9 @@ from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
 
-def _load_mcp_module() -> ModuleType:
-    """Load the content_mcp module directly from its path for test usage."""
-    module_path = (
-        Path(__file__).resolve().parents[1]
-        / "mcp-server"
-        / "content_mcp.py"
-    )
-    spec = importlib.util.spec_from_file_location("content_mcp", module_path)
-    if spec is None or spec.loader is None:
-        raise RuntimeError("Unable to load content_mcp module for testing")
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
-    return module
-
-
 class FetchWebContentTests(TestCase):
     content_mcp: ClassVar[ModuleType]
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        cls.content_mcp = _load_mcp_module()
-
     def test_fetch_web_content_extracts_readable_text(self) -> None:
         html = (
             "<html><head><style>body{}</style></head>"
@@ -49,8 +26,9 @@ class FetchWebContentTests(TestCase):
         mock_response.headers.get_content_charset.return_value = "utf-8"
         mock_response.__enter__.return_value = mock_response
 
-        with patch.object(self.content_mcp.urlrequest, "urlopen", return_value=mock_response):
-            result = self.content_mcp.fetch_web_content("https://example.com/test")
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(self.content_mcp.urlrequest, "urlopen", return_value=mock_response):
+                result = self.content_mcp.fetch_web_content("https://example.com/test")
 
         self.assertEqual(result, "Title\nParagraph 1\nParagraph 2")
 
@@ -61,8 +39,9 @@ class FetchWebContentTests(TestCase):
         mock_response.headers.get_content_charset.return_value = "utf-8"
         mock_response.__enter__.return_value = mock_response
 
-        with patch.object(self.content_mcp.urlrequest, "urlopen", return_value=mock_response):
-            result = self.content_mcp.fetch_web_content("https://example.com/long", max_chars=100)
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(self.content_mcp.urlrequest, "urlopen", return_value=mock_response):
+                result = self.content_mcp.fetch_web_content("https://example.com/long", max_chars=100)
 
         self.assertTrue(result.endswith("...[truncated]"))
         self.assertLessEqual(len(result), 100 + len("\n\n...[truncated]"))
@@ -99,28 +78,75 @@ class FetchWebContentTests(TestCase):
         self.assertIn("Local Test", result)
         self.assertIn("Served from HTTP server.", result)
 
+    def test_fetch_web_content_session_raises_on_http_error_status(self) -> None:
+        response = MagicMock()
+        response.status_code = 404
+        response.reason = "Not Found"
+        session = MagicMock()
+        session.get.return_value = response
+
+        with patch.object(self.content_mcp, "_SESSION", session):
+            with self.assertRaises(Exception) as exc:
+                self.content_mcp.fetch_web_content("https://example.com/missing")
+
+        self.assertIn("Error fetching URL: Not Found", str(exc.exception))
+        response.close.assert_called_once()
+        response.iter_content.assert_not_called()
+
+    def test_fetch_web_contents_batch_preserves_input_order(self) -> None:
+        html = "<p>Shared page body</p>".encode("utf-8")
+        mock_response = MagicMock()
+        mock_response.read.return_value = html
+        mock_response.headers.get_content_charset.return_value = "utf-8"
+        mock_response.__enter__.return_value = mock_response
+
+        urls = ["https://example.com/a", "https://example.com/b"]
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(self.content_mcp.urlrequest, "urlopen", return_value=mock_response):
+                result = self.content_mcp.fetch_web_contents(urls)
+
+        self.assertLess(result.index(urls[0]), result.index(urls[1]))
+        self.assertEqual(result.count("Shared page body"), 2)
+
+    def test_fetch_web_contents_reports_failures_inline(self) -> None:
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(
+                self.content_mcp.urlrequest,
+                "urlopen",
+                side_effect=self.content_mcp.urlerror.URLError("unreachable"),
+            ):
+                result = self.content_mcp.fetch_web_contents(["https://example.com/down"])
+
+        self.assertIn("Error fetching URL:", result)
+
+    def test_fetch_web_contents_rejects_empty_batch(self) -> None:
+        with self.assertRaises(ValueError):
+            self.content_mcp.fetch_web_contents([])
+
     def test_fetch_web_content_rejects_non_http_url(self) -> None:
         with self.assertRaises(ValueError):
             self.content_mcp.fetch_web_content("ftp://example.com/resource")
 
     def test_fetch_web_content_surfaces_network_errors(self) -> None:
-        with patch.object(
-            self.content_mcp.urlrequest,
-            "urlopen",
-            side_effect=self.content_mcp.urlerror.URLError("timeout"),
-        ):
-            with self.assertRaises(Exception) as exc:
-                self.content_mcp.fetch_web_content("https://example.com/boom")
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(
+                self.content_mcp.urlrequest,
+                "urlopen",
+                side_effect=self.content_mcp.urlerror.URLError("timeout"),
+            ):
+                with self.assertRaises(Exception) as exc:
+                    self.content_mcp.fetch_web_content("https://example.com/boom")
 
         self.assertIn("timeout", str(exc.exception))
 
     def test_fetch_web_content_reports_socket_timeout(self) -> None:
-        with patch.object(
-            self.content_mcp.urlrequest,
-            "urlopen",
-            side_effect=self.content_mcp.urlerror.URLError(socket.timeout("timed out")),
-        ):
-            with self.assertRaises(Exception) as exc:
-                self.content_mcp.fetch_web_content("https://example.com/slow", timeout_seconds=3)
+        with patch.object(self.content_mcp, "_SESSION", None):
+            with patch.object(
+                self.content_mcp.urlrequest,
+                "urlopen",
+                side_effect=self.content_mcp.urlerror.URLError(socket.timeout("timed out")),
+            ):
+                with self.assertRaises(Exception) as exc:
+                    self.content_mcp.fetch_web_content("https://example.com/slow", timeout_seconds=3)
 
         self.assertIn("Timed out after 3 seconds", str(exc.exception))
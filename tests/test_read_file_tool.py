@@ -2,53 +2,27 @@
 
 from __future__ import annotations
 
-import importlib.util
-import io
-import sys
+import functools
+import logging
+import shutil
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from types import ModuleType
-from typing import ClassVar
-from unittest import TestCase
-from unittest.mock import MagicMock, patch
-from contextlib import redirect_stderr
-
-
-def _ensure_stub_dependencies() -> None:
-    """Provide lightweight stand-ins for optional dependencies during tests."""
-    if "youtube_transcript_api" not in sys.modules:
-        stub = ModuleType("youtube_transcript_api")
-
-        class _StubYouTubeTranscriptApi:
-            def fetch(self, video_id: str) -> list[dict[str, object]]:
-                # Minimal stub: tests never call this path, but returning an empty
-                # transcript keeps the server logic happy if it does.
-                return []
-
-        stub.YouTubeTranscriptApi = _StubYouTubeTranscriptApi  # type: ignore[attr-defined]
-        sys.modules["youtube_transcript_api"] = stub
-
-
-def _load_mcp_module() -> ModuleType:
-    """Load the content_mcp module directly from its path for test usage."""
-    module_path = (
-        Path(__file__).resolve().parents[1]
-        / "mcp-server"
-        / "content_mcp.py"
-    )
-    spec = importlib.util.spec_from_file_location("content_mcp", module_path)
-    if spec is None or spec.loader is None:
-        raise RuntimeError("Unable to load content_mcp module for testing")
-    _ensure_stub_dependencies()
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
-    return module
-
-
-def _write_simple_pdf(path: Path, text: str) -> None:
-    """Create a minimal PDF file containing the provided text."""
-    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+from unittest.mock import patch
+
+import pytest
+
+
+# Single-pass escaping for text embedded in a PDF literal string
+_PDF_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
+
+@functools.lru_cache(maxsize=None)
+def _build_pdf_bytes(text: str) -> bytes:
+    """Build a minimal PDF containing the provided text.
+
+    Deterministic, so the bytes are memoized and each test just writes
+    them out instead of re-running the builder.
+    """
+    escaped = text.translate(_PDF_ESCAPE_TABLE)
     content = f"BT\n/F1 12 Tf\n72 720 Td\n({escaped}) Tj\nET\n".encode("utf-8")
 
     catalog = b"<< /Type /Catalog /Pages 2 0 R >>\n"
@@ -68,121 +42,160 @@ def _write_simple_pdf(path: Path, text: str) -> None:
 
     objects = [catalog, pages, page, stream, font]
 
-    pdf = bytearray()
-    pdf.extend(b"%PDF-1.4\n")
-    offsets = [0]
+    # Collect parts and join once at the end; bytes.join sizes the final
+    # buffer up front instead of reallocating a growing bytearray
+    parts: list[bytes] = [b"%PDF-1.4\n"]
+    offset = len(parts[0])
+    offsets: list[int] = []
 
     for index, obj in enumerate(objects, start=1):
-        offsets.append(len(pdf))
-        pdf.extend(f"{index} 0 obj\n".encode("ascii"))
-        pdf.extend(obj)
-        if not obj.endswith(b"\n"):
-            pdf.extend(b"\n")
-        pdf.extend(b"endobj\n")
-
-    xref_offset = len(pdf)
-    pdf.extend(f"xref\n0 {len(objects) + 1}\n".encode("ascii"))
-    pdf.extend(b"0000000000 65535 f \n")
-    for start in offsets[1:]:
-        pdf.extend(f"{start:010} 00000 n \n".encode("ascii"))
-
-    pdf.extend(
+        offsets.append(offset)
+        body = obj if obj.endswith(b"\n") else obj + b"\n"
+        part = f"{index} 0 obj\n".encode("ascii") + body + b"endobj\n"
+        parts.append(part)
+        offset += len(part)
+
+    xref_offset = offset
+    parts.append(f"xref\n0 {len(objects) + 1}\n".encode("ascii"))
+    xref_entries = [b"0000000000 65535 f \n"]
+    xref_entries += [f"{start:010} 00000 n \n".encode("ascii") for start in offsets]
+    parts.append(b"".join(xref_entries))
+    parts.append(
         (
             f"trailer<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
             f"startxref\n{xref_offset}\n%%EOF\n"
         ).encode("ascii")
     )
 
-    path.write_bytes(pdf)
+    return b"".join(parts)
+
+
+class _ListHandler(logging.Handler):
+    """Capture emitted records in a list for assertions."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture(scope="module")
+def docx_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # The DOCX fixture content is static; build it once and let tests
+    # copy the file instead of re-running python-docx serialization
+    from docx import Document  # type: ignore[import-not-found]
+
+    path = tmp_path_factory.mktemp("docx") / "sample.docx"
+    document = Document()
+    document.add_heading("Sample Heading", level=1)
+    document.add_paragraph("Body paragraph content.")
+    document.save(str(path))
+    return path
+
+
+def test_read_text_file_returns_contents(content_mcp, tmp_path: Path) -> None:
+    file_path = tmp_path / "sample.txt"
+    file_path.write_text("Line 1\nLine 2", encoding="utf-8")
+
+    result = content_mcp.read_file(str(file_path))
+
+    assert result == "Line 1\nLine 2"
+
+
+def test_read_markdown_truncates_output(content_mcp, tmp_path: Path) -> None:
+    file_path = tmp_path / "notes.md"
+    file_path.write_text("A" * 120, encoding="utf-8")
+
+    result = content_mcp.read_file(str(file_path), max_chars=50)
+
+    assert result.endswith("...[truncated]")
+    assert len(result) <= 50 + len("\n\n...[truncated]")
+
+
+def test_read_docx_file_extracts_text(content_mcp, tmp_path: Path, docx_template: Path) -> None:
+    doc_path = tmp_path / "document.docx"
+    shutil.copyfile(docx_template, doc_path)
+
+    result = content_mcp.read_file(str(doc_path))
 
+    assert "Sample Heading" in result
+    assert "Body paragraph content." in result
 
-class ReadFileToolTests(TestCase):
-    content_mcp: ClassVar[ModuleType]
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        cls.content_mcp = _load_mcp_module()
+def test_read_pdf_file_extracts_text(content_mcp, tmp_path: Path) -> None:
+    pdf_path = tmp_path / "document.pdf"
+    pdf_path.write_bytes(_build_pdf_bytes("PDF body text."))
 
-    def setUp(self) -> None:
-        self._temp_dir = TemporaryDirectory()
-        self.temp_path = Path(self._temp_dir.name)
+    result = content_mcp.read_file(str(pdf_path))
 
-    def tearDown(self) -> None:
-        self._temp_dir.cleanup()
+    assert "PDF body text." in result
 
-    def test_read_text_file_returns_contents(self) -> None:
-        file_path = self.temp_path / "sample.txt"
-        file_path.write_text("Line 1\nLine 2", encoding="utf-8")
 
-        result = self.content_mcp.read_file(str(file_path))
+def test_read_doc_file_uses_best_effort_fallback(content_mcp, tmp_path: Path) -> None:
+    doc_path = tmp_path / "legacy.doc"
+    payload = b"\xd0\xcf\x11\xe0" + b"Hello DOC content!" + b"\x00" * 8
+    doc_path.write_bytes(payload)
 
-        self.assertEqual(result, "Line 1\nLine 2")
+    with patch.object(content_mcp, "_extract_doc_with_textract", return_value=None):
+        result = content_mcp.read_file(str(doc_path))
 
-    def test_read_markdown_truncates_output(self) -> None:
-        file_path = self.temp_path / "notes.md"
-        file_path.write_text("A" * 120, encoding="utf-8")
+    assert "Hello DOC content" in result
 
-        result = self.content_mcp.read_file(str(file_path), max_chars=50)
 
-        self.assertTrue(result.endswith("...[truncated]"))
-        self.assertLessEqual(len(result), 50 + len("\n\n...[truncated]"))
+def test_read_file_rejects_unsupported_extension(content_mcp, tmp_path: Path) -> None:
+    data_path = tmp_path / "data.json"
+    data_path.write_text("{}", encoding="utf-8")
 
-    def test_read_docx_file_extracts_text(self) -> None:
-        from docx import Document  # type: ignore[import-not-found]
+    with pytest.raises(ValueError):
+        content_mcp.read_file(str(data_path))
 
-        doc_path = self.temp_path / "document.docx"
-        document = Document()
-        document.add_heading("Sample Heading", level=1)
-        document.add_paragraph("Body paragraph content.")
-        document.save(str(doc_path))
 
-        result = self.content_mcp.read_file(str(doc_path))
+def test_read_file_rejects_directory_path(content_mcp, tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        content_mcp.read_file(str(tmp_path))
 
-        self.assertIn("Sample Heading", result)
-        self.assertIn("Body paragraph content.", result)
 
-    def test_read_pdf_file_extracts_text(self) -> None:
-        pdf_path = self.temp_path / "document.pdf"
-        _write_simple_pdf(pdf_path, "PDF body text.")
+def test_read_files_batch_preserves_input_order(content_mcp, tmp_path: Path) -> None:
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("First file body", encoding="utf-8")
+    second.write_text("Second file body", encoding="utf-8")
 
-        result = self.content_mcp.read_file(str(pdf_path))
+    result = content_mcp.read_files([str(first), str(second)])
 
-        self.assertIn("PDF body text.", result)
+    assert result.index("First file body") < result.index("Second file body")
+    assert f"=== {first} ===" in result
+    assert f"=== {second} ===" in result
 
-    def test_read_doc_file_uses_best_effort_fallback(self) -> None:
-        doc_path = self.temp_path / "legacy.doc"
-        payload = b"\xd0\xcf\x11\xe0" + b"Hello DOC content!" + b"\x00" * 8
-        doc_path.write_bytes(payload)
 
-        with patch.object(self.content_mcp, "_extract_doc_with_textract", return_value=None):
-            result = self.content_mcp.read_file(str(doc_path))
+def test_read_files_batch_reports_failures_inline(content_mcp, tmp_path: Path) -> None:
+    present = tmp_path / "present.txt"
+    present.write_text("Still readable", encoding="utf-8")
+    missing = tmp_path / "missing.txt"
 
-        self.assertIn("Hello DOC content", result)
+    result = content_mcp.read_files([str(missing), str(present)])
 
-    def test_read_file_rejects_unsupported_extension(self) -> None:
-        data_path = self.temp_path / "data.json"
-        data_path.write_text("{}", encoding="utf-8")
+    assert "Error reading file:" in result
+    assert "Still readable" in result
 
-        with self.assertRaises(ValueError):
-            self.content_mcp.read_file(str(data_path))
 
-    def test_read_file_rejects_directory_path(self) -> None:
-        with self.assertRaises(ValueError):
-            self.content_mcp.read_file(str(self.temp_path))
+def test_read_files_rejects_empty_batch(content_mcp) -> None:
+    with pytest.raises(ValueError):
+        content_mcp.read_files([])
 
-    def test_read_file_debug_logging_emits_messages(self) -> None:
-        buffer = io.StringIO()
-        with patch.object(self.content_mcp, "_READ_FILE_DEBUG", True):
-            with patch.object(self.content_mcp, "_LOGGER") as mock_logger:
-                mock_logger.handlers = []
-                mock_logger.setLevel = MagicMock()
-                mock_logger.info = MagicMock()
-                mock_logger.addHandler = MagicMock()
-                mock_logger.propagate = True
 
-                with self.assertRaises(FileNotFoundError):
-                    self.content_mcp.read_file("/definitely/not/here.txt")
+def test_read_file_debug_logging_emits_messages(content_mcp) -> None:
+    handler = _ListHandler()
+    logger = content_mcp._LOGGER
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        with patch.object(content_mcp, "_READ_FILE_DEBUG", True):
+            with pytest.raises(FileNotFoundError):
+                content_mcp.read_file("/definitely/not/here.txt")
+    finally:
+        logger.removeHandler(handler)
 
-        mock_logger.addHandler.assert_called()
-        mock_logger.setLevel.assert_called()
-        mock_logger.info.assert_called()
+    assert any(record.levelno == logging.INFO for record in handler.records)